@@ -0,0 +1,53 @@
+from pathlib import Path
+from typing import Optional, Tuple
+import hashlib
+import os
+import tempfile
+import time
+
+import numpy as np
+
+# Historical closes are stored under $NT_CACHE and reused while younger than the TTL
+CACHE_DIR = Path(os.environ.get("NT_CACHE", "~/.cache/nordnet")).expanduser()
+HISTORY_CACHE_DIR = CACHE_DIR / "historical"
+HISTORY_CACHE_TTL_SECONDS = 3600.0
+
+
+def _history_path(symbol: str, period: str) -> Path:
+    """Cache file for a (symbol, period) pair, named by its content hash."""
+    key = hashlib.sha1(f"{symbol}|{period}".encode()).hexdigest()
+    return HISTORY_CACHE_DIR / f"{key}.npy"
+
+
+def load_history(symbol: str, period: str) -> Optional[Tuple[np.ndarray, float]]:
+    """Return (closes, file age in seconds) if the file is still fresh, else None."""
+    path = _history_path(symbol, period)
+    try:
+        age = max(0.0, time.time() - path.stat().st_mtime)
+        if age < HISTORY_CACHE_TTL_SECONDS:
+            return np.load(path), age
+    except (OSError, ValueError, EOFError):
+        # Missing, unreadable or truncated files are treated as a cache miss
+        pass
+    return None
+
+
+def store_history(symbol: str, period: str, prices: np.ndarray):
+    """Atomically write closes to the cache so readers never see partial files."""
+    path = _history_path(symbol, period)
+    tmp_path = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temp file per write, so concurrent writers of the same
+        # key (threads or processes) never share a partially written file
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            np.save(f, prices)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error caching historical data at {path}: {e}")
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,41 @@
+import numpy as np
+
+try:
+    from numba import njit, types
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+# Shared kernel options. Indices are always in range, so bounds checks
+# are skipped, and compiled code is cached in __pycache__ across runs.
+# No fastmath: contracting to FMA changes results vs. the NumPy fallback.
+_JIT_OPTIONS = dict(cache=True, boundscheck=False, error_model='numpy')
+
+if HAS_NUMBA:
+    # Explicit signatures compile eagerly at import instead of on the first
+    # request. Cached histories are read-only, so accept both array kinds.
+    _F8_1D = types.Array(types.float64, 1, 'C')
+    _F8_1D_RO = types.Array(types.float64, 1, 'C', readonly=True)
+    _ALL_IN_SIGNATURES = [(_F8_1D, types.float64), (_F8_1D_RO, types.float64)]
+else:
+    _ALL_IN_SIGNATURES = []
+
+
+@njit(_ALL_IN_SIGNATURES, **_JIT_OPTIONS)
+def _all_in_kernel(prices, cash):
+    """Equity curve for buying as many shares as possible at prices[0]."""
+    qty = cash // prices[0]
+    rem = cash - qty * prices[0]
+    out = np.empty_like(prices)
+    for i in range(prices.size):
+        out[i] = rem + qty * prices[i]
+    return out
@@ -1,16 +1,35 @@
-from typing import Dict, List
+from typing import Dict, List, Literal, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
-from pydantic import BaseModel
+from functools import lru_cache
+import threading
+import time
+from pydantic import BaseModel, Field
+import numpy as np
+import pandas as pd
 import yfinance as yf
 
+from app._disk_cache import HISTORY_CACHE_TTL_SECONDS, load_history, store_history
+
+# How long a fetched price is reused before hitting yfinance again
+PRICE_TTL_SECONDS = 30.0
+
+# In-process LRU layer over the disk cache:
+# (symbol, period) -> (read-only closes, time.monotonic() when they expire)
+HISTORY_MEMO_MAXSIZE = 256
+_history_memo: "OrderedDict[Tuple[str, str], Tuple[np.ndarray, float]]" = OrderedDict()
+_history_memo_lock = threading.Lock()
+
 
 class Trade(BaseModel):
-    symbol: str
-    quantity: int
-    action: str  # "buy" or "sell"
+    symbol: str = Field(min_length=1)
+    quantity: int = Field(gt=0)
+    action: Literal["buy", "sell"]
 
 
-class TradeRecord(BaseModel):
+@dataclass(slots=True)
+class TradeRecord:
     symbol: str
     quantity: int
     action: str
@@ -19,59 +38,157 @@ class TradeRecord(BaseModel):
     total_value: float
 
 
-def get_historical_prices(symbol: str, period="1y"):
-    """Get historical closing prices for a symbol."""
-    try:
-        data = yf.download(symbol, period=period, progress=False)
-        return data['Close'].tolist() if 'Close' in data.columns else []
-    except Exception as e:
-        print(f"Error fetching historical data for {symbol}: {e}")
-        return []
+@lru_cache(maxsize=1024)
+def _symbol_hash(symbol: str) -> int:
+    """Stable integer derived from a symbol, used for mock fallback prices."""
+    return sum(map(ord, symbol))
+
+
+def _close_prices(data: pd.DataFrame, symbol: str) -> pd.Series:
+    """Extract closing prices for a symbol from a yf.download frame.
+
+    Handles flat columns as well as both multi-level layouts: (Ticker, Price)
+    from group_by='ticker' and the default (Price, Ticker).
+    """
+    if isinstance(data.columns, pd.MultiIndex):
+        if symbol in data.columns.get_level_values(0):
+            data = data[symbol]
+        elif 'Close' in data.columns.get_level_values(0):
+            closes = data['Close']
+            if symbol not in closes.columns:
+                return pd.Series(dtype=float)
+            return closes[symbol].dropna()
+        else:
+            return pd.Series(dtype=float)
+    if 'Close' not in data.columns:
+        return pd.Series(dtype=float)
+    return data['Close'].dropna()
+
+
+def get_historical_prices(symbol: str, period="1y") -> np.ndarray:
+    """Get historical closing prices for a symbol as a read-only float64 array."""
+    # yf.download upper-cases tickers in its columns, so match that here and
+    # keep the memo and disk cache keyed on one spelling
+    symbol = symbol.upper()
+    memo_key = (symbol, period)
+    with _history_memo_lock:
+        memo = _history_memo.get(memo_key)
+        if memo is not None:
+            if time.monotonic() < memo[1]:
+                _history_memo.move_to_end(memo_key)
+                return memo[0]
+            del _history_memo[memo_key]
+    
+    cached = load_history(symbol, period)
+    if cached is not None:
+        # Expire with the file, not a full TTL after we happened to read it
+        prices, age = cached
+    else:
+        age = 0.0
+        try:
+            data = yf.download(symbol, period=period, group_by='ticker', progress=False)
+            prices = _close_prices(data, symbol).to_numpy(dtype=np.float64)
+        except Exception as e:
+            print(f"Error fetching historical data for {symbol}: {e}")
+            return np.empty(0, dtype=np.float64)
+        if not prices.size:
+            return prices
+        store_history(symbol, period, prices)
+    
+    # Shared between callers, so make sure nobody mutates the cached copy
+    prices.flags.writeable = False
+    _remember_history(memo_key, prices, time.monotonic() + HISTORY_CACHE_TTL_SECONDS - age)
+    return prices
+
+
+def _remember_history(memo_key: Tuple[str, str], prices: np.ndarray, expires: float):
+    """Memoize closes until `expires`, dropping stale and least recently used entries."""
+    with _history_memo_lock:
+        _history_memo[memo_key] = (prices, expires)
+        _history_memo.move_to_end(memo_key)
+        now = time.monotonic()
+        for key in [k for k, (_, exp) in _history_memo.items() if exp <= now]:
+            del _history_memo[key]
+        while len(_history_memo) > HISTORY_MEMO_MAXSIZE:
+            _history_memo.popitem(last=False)
 
 
 class Broker:
     def __init__(self):
-        self.trade_history: List[Dict] = []
-        # Cache for stock prices
-        self.prices: Dict[str, float] = {}
+        self.trade_history: List[TradeRecord] = []
+        # Cache for stock prices: symbol -> (price, time.monotonic() at fetch)
+        self.prices: Dict[str, Tuple[float, float]] = {}
+    
+    def get_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Get current prices for several symbols with one batched download."""
+        now = time.monotonic()
+        prices: Dict[str, float] = {}
+        stale: List[str] = []
+        # Fetch and cache by upper-cased ticker, matching yf.download's columns
+        for symbol in dict.fromkeys(symbol.upper() for symbol in symbols):
+            cached = self.prices.get(symbol)
+            if cached is not None and now - cached[1] < PRICE_TTL_SECONDS:
+                prices[symbol] = cached[0]
+            else:
+                stale.append(symbol)
+        
+        if stale:
+            try:
+                data = yf.download(
+                    tickers=" ".join(stale),
+                    period="1d",
+                    group_by='ticker',
+                    threads=True,
+                    progress=False
+                )
+                for symbol in stale:
+                    closes = _close_prices(data, symbol)
+                    if not closes.empty:
+                        prices[symbol] = float(closes.iloc[-1])
+            except Exception as e:
+                print(f"Error fetching prices for {stale}: {e}")
+        
+        # Anything the batch did not cover goes through the per-symbol path
+        for symbol in stale:
+            if symbol not in prices:
+                prices[symbol] = self._fetch_price(symbol)
+            self.prices[symbol] = (prices[symbol], now)
+        
+        return {symbol: prices[symbol.upper()] for symbol in symbols}
     
     def get_price(self, symbol: str) -> float:
-        """Get current price for a symbol using yfinance."""
+        """Get current price for a symbol."""
+        return self.get_prices([symbol])[symbol]
+    
+    def _fetch_price(self, symbol: str) -> float:
+        """Get current price for a single symbol using yf.Ticker."""
         try:
             ticker = yf.Ticker(symbol)
-            info = ticker.info
+            # fast_info pulls a small quote payload instead of the full
+            # company profile that ticker.info downloads
+            fast_info = ticker.fast_info
             
             # Try different price fields in order of preference
-            price = (
-                info.get('currentPrice') or 
-                info.get('regularMarketPrice') or 
-                info.get('previousClose')
-            )
+            price = fast_info.last_price or fast_info.previous_close
             
             if price:
-                self.prices[symbol] = float(price)
                 return float(price)
             
             # Fallback: get latest close from history
             hist = ticker.history(period="1d")
             if not hist.empty and 'Close' in hist.columns:
-                price = float(hist['Close'].iloc[-1])
-                self.prices[symbol] = price
-                return price
+                return float(hist['Close'].iloc[-1])
                 
         except Exception as e:
             print(f"Error fetching price for {symbol}: {e}")
         
         # If all else fails, return cached price or generate mock price
         if symbol in self.prices:
-            return self.prices[symbol]
+            return self.prices[symbol][0]
         
         # Generate a pseudo-random price based on symbol as fallback
         base_price = 100.0
-        symbol_value = sum(ord(c) for c in symbol)
-        fallback_price = base_price + (symbol_value % 200)
-        self.prices[symbol] = fallback_price
-        return fallback_price
+        return base_price + (_symbol_hash(symbol) % 200)
     
     def execute_trade(self, portfolio, trade: Trade) -> Dict:
         """Execute a trade and update portfolio."""
@@ -84,32 +201,30 @@ class Broker:
             
             portfolio.add_position(trade.symbol, trade.quantity, current_price)
         
-        elif trade.action == "sell":
+        else:
+            # Trade.action is validated as "buy" or "sell"
             if not portfolio.remove_position(trade.symbol, trade.quantity):
-                if trade.symbol not in portfolio.positions:
+                if portfolio.get_position(trade.symbol) is None:
                     return {"error": "No position to sell"}
                 else:
                     return {"error": "Insufficient shares"}
             
             portfolio.add_cash(total_value)
         
-        else:
-            return {"error": "Invalid action. Use 'buy' or 'sell'"}
-        
         # Record the trade
-        trade_record = {
-            "symbol": trade.symbol,
-            "quantity": trade.quantity,
-            "action": trade.action,
-            "price": current_price,
-            "total_value": total_value,
-            "timestamp": datetime.now().isoformat()
-        }
+        trade_record = TradeRecord(
+            symbol=trade.symbol,
+            quantity=trade.quantity,
+            action=trade.action,
+            price=current_price,
+            timestamp=datetime.now().isoformat(),
+            total_value=total_value
+        )
         self.trade_history.append(trade_record)
         
         return {"success": True, "trade": trade_record}
     
-    def get_trade_history(self) -> List[Dict]:
+    def get_trade_history(self) -> List[TradeRecord]:
         """Get all trade history."""
         return self.trade_history
     
@@ -1,11 +1,32 @@
+import asyncio
+
+import orjson
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.portfolio import Portfolio
 from app.broker import Broker, Trade, get_historical_prices
 from app.simulator import TradingSimulator, all_in_sim
 
-app = FastAPI(title="Nordnet Trading Simulator")
+
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    As the default class, content has already been through FastAPI's
+    jsonable_encoder. Handlers with large payloads return an instance
+    directly to skip that per-element walk, which also lets NumPy arrays
+    reach orjson as-is.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+app = FastAPI(
+    title="Nordnet Trading Simulator",
+    default_response_class=OrjsonResponse
+)
 
 # Configure CORS
 app.add_middleware(
@@ -17,7 +38,7 @@ app.add_middleware(
 )
 
 # Initialize core components
-portfolio = Portfolio(initial_cash=100000.0)
+portfolio = Portfolio(cash=100000.0)
 broker = Broker()
 simulator = TradingSimulator()
 simulator.initialize_performance_tracker(100000.0)
@@ -31,15 +52,19 @@ async def root():
 @app.get("/portfolio")
 async def get_portfolio():
     portfolio_data = portfolio.to_dict()
-    total_value = portfolio.get_total_value(broker.get_price)
+    current_prices = await asyncio.to_thread(broker.get_prices, list(portfolio.symbols))
+    total_value = portfolio.value(current_prices)
     
     # Add current prices to positions
     for position in portfolio_data["positions"]:
-        current_price = broker.get_price(position["symbol"])
+        current_price = current_prices[position["symbol"]]
         position["current_price"] = current_price
         position["market_value"] = current_price * position["quantity"]
         position["profit_loss"] = (current_price - position["avg_price"]) * position["quantity"]
-        position["profit_loss_pct"] = ((current_price - position["avg_price"]) / position["avg_price"]) * 100
+        position["profit_loss_pct"] = (
+            ((current_price - position["avg_price"]) / position["avg_price"]) * 100
+            if position["avg_price"] > 0 else 0
+        )
     
     return {
         **portfolio_data,
@@ -50,9 +75,13 @@ async def get_portfolio():
 
 @app.post("/trade")
 async def execute_trade(trade: Trade):
-    # Analyze trade before execution
-    current_price = broker.get_price(trade.symbol)
-    portfolio_value = portfolio.get_total_value(broker.get_price)
+    # Analyze trade before execution. Fetching the traded symbol together
+    # with the holdings warms the broker cache used by execute_trade below.
+    current_prices = await asyncio.to_thread(
+        broker.get_prices, [trade.symbol, *portfolio.symbols]
+    )
+    current_price = current_prices[trade.symbol]
+    portfolio_value = portfolio.value(current_prices)
     
     analysis = simulator.analyze_trade(
         trade.action, 
@@ -81,14 +110,21 @@ async def get_trade_history():
 
 @app.get("/stock/{symbol}")
 async def get_stock_price(symbol: str):
-    price = broker.get_price(symbol)
+    price = await asyncio.to_thread(broker.get_price, symbol)
     return {"symbol": symbol, "price": price}
 
 
 @app.get("/risk")
 async def get_risk_metrics():
     positions = portfolio.get_all_positions()
-    risk_metrics = simulator.get_risk_metrics(positions, broker.get_price)
+    symbols = [pos["symbol"] for pos in positions]
+    histories = await asyncio.gather(
+        *(asyncio.to_thread(get_historical_prices, symbol) for symbol in symbols)
+    )
+    risk_metrics = await asyncio.to_thread(
+        simulator.get_risk_metrics, positions, broker.get_prices,
+        dict(zip(symbols, histories))
+    )
     return risk_metrics
 
 
@@ -100,22 +136,22 @@ async def get_performance():
 @app.get("/historical/{symbol}")
 async def get_historical_data(symbol: str, period: str = "1y"):
     """Get historical price data for a symbol."""
-    prices = get_historical_prices(symbol, period)
-    return {
+    prices = await asyncio.to_thread(get_historical_prices, symbol, period)
+    return OrjsonResponse({
         "symbol": symbol,
         "period": period,
         "prices": prices,
         "count": len(prices)
-    }
+    })
 
 
 @app.get("/simulate/{symbol}")
 async def simulate_all_in(symbol: str, period: str = "1y"):
     """Simulate an all-in buy strategy for a symbol."""
     # Get historical prices
-    price_history = get_historical_prices(symbol, period)
+    price_history = await asyncio.to_thread(get_historical_prices, symbol, period)
     
-    if not price_history:
+    if len(price_history) == 0:
         return {
             "error": f"No price data available for {symbol}",
             "symbol": symbol
@@ -131,7 +167,7 @@ async def simulate_all_in(symbol: str, period: str = "1y"):
     final_value = portfolio_values[-1] if portfolio_values else initial_value
     total_return = ((final_value - initial_value) / initial_value) * 100
     
-    return {
+    return OrjsonResponse({
         "symbol": symbol,
         "period": period,
         "initial_cash": initial_value,
@@ -139,4 +175,4 @@ async def simulate_all_in(symbol: str, period: str = "1y"):
         "total_return_pct": round(total_return, 2),
         "portfolio_values": portfolio_values,
         "data_points": len(portfolio_values)
-    }
+    })
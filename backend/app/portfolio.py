@@ -1,8 +1,12 @@
 from typing import Dict, List, Optional
-from pydantic import BaseModel
+from dataclasses import dataclass
+import math
 
+import numpy as np
 
-class Position(BaseModel):
+
+@dataclass(slots=True)
+class Position:
     symbol: str
     quantity: int
     avg_price: float
@@ -11,49 +15,90 @@ class Position(BaseModel):
 class Portfolio:
     def __init__(self, cash=10000):
         self.cash = cash
-        self.holdings = {}
+        # Holdings are stored column-wise: symbols[i] holds qtys[i] shares
+        # bought for a running total of costs[i]
+        self.symbols: List[str] = []
+        self.qtys = np.empty(0, dtype=np.int64)
+        self.costs = np.empty(0, dtype=np.float64)
+        self._symbol_index: Dict[str, int] = {}
+
+    @property
+    def holdings(self) -> Dict[str, int]:
+        return dict(zip(self.symbols, self.qtys.tolist()))
+
+    def _add_quantity(self, symbol: str, quantity: int, price: float):
+        idx = self._symbol_index.get(symbol)
+        if idx is None:
+            self._symbol_index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            self.qtys = np.append(self.qtys, np.int64(quantity))
+            self.costs = np.append(self.costs, price * quantity)
+        else:
+            self.qtys[idx] += quantity
+            self.costs[idx] += price * quantity
+
+    def _avg_price(self, idx: int) -> float:
+        return float(self.costs[idx] / self.qtys[idx])
 
     def buy(self, symbol, price, quantity):
+        # Only whole shares are held, so charge for exactly what is recorded
+        quantity = math.floor(quantity)
+        # Nothing to buy; an empty holding would also have a 0/0 average price
+        if quantity <= 0:
+            return
         cost = price * quantity
         if self.cash >= cost:
             self.cash -= cost
-            self.holdings[symbol] = self.holdings.get(symbol, 0) + quantity
+            self._add_quantity(symbol, quantity, price)
 
     def value(self, current_prices):
-        total = self.cash
-        for sym, qty in self.holdings.items():
-            total += current_prices.get(sym, 0) * qty
-        return total
+        price_vec = np.fromiter(
+            (current_prices.get(sym, 0.0) for sym in self.symbols),
+            dtype=np.float64,
+            count=len(self.symbols)
+        )
+        return self.cash + float(self.qtys @ price_vec)
     
     # Keep compatibility with existing code
     def get_position(self, symbol: str) -> Optional[Dict]:
-        if symbol in self.holdings:
-            return {"quantity": self.holdings[symbol], "avg_price": 0}
-        return None
+        if (idx := self._symbol_index.get(symbol)) is None:
+            return None
+        return {"quantity": int(self.qtys[idx]), "avg_price": self._avg_price(idx)}
     
     def get_all_positions(self) -> List[Dict]:
+        avg_prices = (self.costs / self.qtys).tolist()
         return [
             {
                 "symbol": symbol,
                 "quantity": qty,
-                "avg_price": 0
+                "avg_price": avg_price
             }
-            for symbol, qty in self.holdings.items()
+            for symbol, qty, avg_price in zip(self.symbols, self.qtys.tolist(), avg_prices)
         ]
     
     def add_position(self, symbol: str, quantity: int, price: float):
-        self.buy(symbol, price, quantity)
+        # Cash is settled by the caller (see Broker.execute_trade)
+        if quantity > 0:
+            self._add_quantity(symbol, quantity, price)
     
     def remove_position(self, symbol: str, quantity: int) -> bool:
-        if symbol not in self.holdings:
+        idx = self._symbol_index.get(symbol)
+        if idx is None or self.qtys[idx] < quantity:
             return False
         
-        if self.holdings[symbol] < quantity:
-            return False
+        if self.qtys[idx] > quantity:
+            # Selling keeps the average price, so scale the cost down pro rata
+            self.costs[idx] -= self._avg_price(idx) * quantity
+            self.qtys[idx] -= quantity
+            return True
         
-        self.holdings[symbol] -= quantity
-        if self.holdings[symbol] == 0:
-            del self.holdings[symbol]
+        # Position closed: delete in place so holdings keep insertion order
+        del self.symbols[idx]
+        self.qtys = np.delete(self.qtys, idx)
+        self.costs = np.delete(self.costs, idx)
+        del self._symbol_index[symbol]
+        for later in self.symbols[idx:]:
+            self._symbol_index[later] -= 1
         
         return True
     
@@ -66,10 +111,8 @@ class Portfolio:
     def add_cash(self, amount: float):
         self.cash += amount
     
-    def get_total_value(self, get_price_func) -> float:
-        current_prices = {}
-        for symbol in self.holdings.keys():
-            current_prices[symbol] = get_price_func(symbol)
+    def get_total_value(self, get_prices_func) -> float:
+        current_prices = get_prices_func(list(self.symbols))
         return self.value(current_prices)
     
     def to_dict(self) -> Dict:
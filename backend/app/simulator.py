@@ -1,24 +1,33 @@
-from typing import Dict, List
-import random
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app._kernels import HAS_NUMBA, _all_in_kernel
 
 
 def all_in_sim(portfolio, symbol, price_history):
     """Simulate an all-in buy strategy with historical prices."""
-    if not price_history:
+    if len(price_history) == 0:
         return []
     start_price = price_history[0]
-    quantity = portfolio.cash // start_price
+    cash = float(portfolio.cash)
+    quantity = cash // start_price
     portfolio.buy(symbol, start_price, quantity)
 
-    values = []
-    for price in price_history:
-        values.append(portfolio.value({symbol: price}))
-    return values
+    prices = np.ascontiguousarray(price_history, dtype=np.float64)
+    if HAS_NUMBA:
+        return _all_in_kernel(prices, cash).tolist()
+
+    # Holdings are constant after the initial buy, so the equity curve is
+    # simply cash left over plus quantity times each price.
+    cash_left = portfolio.cash
+    return (cash_left + quantity * prices).tolist()
 
 
 class RiskCalculator:
     @staticmethod
-    def calculate_portfolio_risk(positions: List[Dict], get_price_func) -> Dict:
+    def calculate_portfolio_risk(positions: List[Dict], get_prices_func,
+                                 price_history: Optional[Dict[str, np.ndarray]] = None) -> Dict:
         """Calculate risk metrics for the portfolio."""
         if not positions:
             return {
@@ -28,23 +37,33 @@ class RiskCalculator:
                 "risk_level": "low"
             }
         
-        total_value = sum(
-            pos["quantity"] * get_price_func(pos["symbol"]) 
-            for pos in positions
-        )
+        # Price every position once, then derive total and max from the same values
+        prices = get_prices_func([pos["symbol"] for pos in positions])
+        position_values = [pos["quantity"] * prices[pos["symbol"]] for pos in positions]
+        total_value = sum(position_values)
         
-        # Mock volatility calculation (in production, use historical data)
-        volatility = random.uniform(0.1, 0.3)
+        # Annualized volatility of daily log returns, weighted by position value
+        weighted_vol = 0.0
+        weight_sum = 0.0
+        for pos, pos_value in zip(positions, position_values):
+            hist = (price_history or {}).get(pos["symbol"])
+            if hist is None:
+                continue
+            # Log returns are undefined for non-positive or missing closes
+            hist = hist[np.isfinite(hist) & (hist > 0)]
+            if len(hist) < 2:
+                continue
+            returns = np.diff(np.log(hist))
+            weighted_vol += pos_value * float(np.std(returns) * np.sqrt(252))
+            weight_sum += pos_value
+        volatility = weighted_vol / weight_sum if weight_sum > 0 else 0.0
         
         # Diversification score based on number of positions
         num_positions = len(positions)
         diversification_score = min(100, num_positions * 20)
         
         # Risk level based on concentration
-        max_position_value = max(
-            pos["quantity"] * get_price_func(pos["symbol"]) 
-            for pos in positions
-        )
+        max_position_value = max(position_values)
         concentration = max_position_value / total_value if total_value > 0 else 0
         
         if concentration > 0.5:
@@ -129,9 +148,12 @@ class TradingSimulator:
             "recommendation": "proceed"
         }
     
-    def get_risk_metrics(self, positions: List[Dict], get_price_func) -> Dict:
+    def get_risk_metrics(self, positions: List[Dict], get_prices_func,
+                         price_history: Optional[Dict[str, np.ndarray]] = None) -> Dict:
         """Get current risk metrics."""
-        return self.risk_calculator.calculate_portfolio_risk(positions, get_price_func)
+        return self.risk_calculator.calculate_portfolio_risk(
+            positions, get_prices_func, price_history
+        )
     
     def get_performance_summary(self) -> Dict:
         """Get performance summary."""
@@ -0,0 +1,13 @@
+import pytest
+
+import app._disk_cache as disk_cache
+import app.broker as broker
+
+
+@pytest.fixture(autouse=True)
+def isolated_history_cache(tmp_path, monkeypatch):
+    """Keep every test's history cache in its own empty directory."""
+    monkeypatch.setattr(disk_cache, "HISTORY_CACHE_DIR", tmp_path / "historical")
+    broker._history_memo.clear()
+    yield
+    broker._history_memo.clear()
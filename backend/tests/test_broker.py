@@ -0,0 +1,123 @@
+import os
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app.broker as broker
+from app._disk_cache import HISTORY_CACHE_TTL_SECONDS, _history_path, store_history
+from app.broker import _close_prices, get_historical_prices
+
+CLOSES = [10.0, 11.0, 12.0]
+
+
+def _frame(symbol, names):
+    """A yf.download-style frame with two-level columns ordered as `names`."""
+    fields = {"Open": [1.0, 2.0, 3.0], "Close": CLOSES}
+    columns = {
+        (symbol, field) if names[0] == "Ticker" else (field, symbol): values
+        for field, values in fields.items()
+    }
+    data = pd.DataFrame(columns)
+    data.columns = pd.MultiIndex.from_tuples(data.columns, names=names)
+    return data
+
+
+@pytest.mark.parametrize("names", [["Ticker", "Price"], ["Price", "Ticker"]])
+def test_close_prices_handles_both_multiindex_layouts(names):
+    data = _frame("AAPL", names)
+    assert _close_prices(data, "AAPL").tolist() == CLOSES
+    assert _close_prices(data, "MSFT").empty
+
+
+def test_close_prices_handles_flat_columns():
+    data = pd.DataFrame({"Close": [1.0, np.nan, 2.0]})
+    assert _close_prices(data, "AAPL").tolist() == [1.0, 2.0]
+
+
+@pytest.mark.parametrize("symbol", ["AAPL", "aapl"])
+@pytest.mark.parametrize("names", [["Ticker", "Price"], ["Price", "Ticker"]])
+def test_get_historical_prices_parses_download(monkeypatch, names, symbol):
+    monkeypatch.setattr(broker.yf, "download", lambda *args, **kwargs: _frame("AAPL", names))
+    prices = get_historical_prices(symbol)
+    assert prices.dtype == np.float64
+    assert prices.tolist() == CLOSES
+    assert not prices.flags.writeable
+
+
+def test_memo_expires_with_the_cache_file():
+    store_history("AAPL", "1y", np.array(CLOSES))
+    # The file is 10 seconds short of the TTL when first read
+    mtime = time.time() - HISTORY_CACHE_TTL_SECONDS + 10
+    os.utime(_history_path("AAPL", "1y"), (mtime, mtime))
+
+    assert get_historical_prices("AAPL").tolist() == CLOSES
+    _, expires = broker._history_memo[("AAPL", "1y")]
+    assert 0 < expires - time.monotonic() <= 10
+
+
+def test_memo_is_bounded_and_drops_expired_entries(monkeypatch):
+    monkeypatch.setattr(broker, "HISTORY_MEMO_MAXSIZE", 2)
+    monkeypatch.setattr(broker.yf, "download", lambda symbol, **kwargs: _frame(symbol, ["Ticker", "Price"]))
+
+    for symbol in ["AAPL", "MSFT", "AAPL", "NVDA"]:
+        get_historical_prices(symbol)
+    # AAPL was used more recently than MSFT, so MSFT is evicted first
+    assert list(broker._history_memo) == [("AAPL", "1y"), ("NVDA", "1y")]
+
+    broker._history_memo[("AAPL", "1y")] = (np.array(CLOSES), time.monotonic() - 1)
+    get_historical_prices("TSLA")
+    assert list(broker._history_memo) == [("NVDA", "1y"), ("TSLA", "1y")]
+
+
+def test_get_prices_batches_lowercase_symbols(monkeypatch):
+    monkeypatch.setattr(broker.yf, "download", lambda tickers, **kwargs: _frame(tickers.upper(), ["Price", "Ticker"]))
+    monkeypatch.setattr(broker.yf, "Ticker", lambda symbol: pytest.fail(f"per-symbol fetch for {symbol}"))
+
+    assert broker.Broker().get_prices(["aapl"]) == {"aapl": CLOSES[-1]}
+
+
+@pytest.fixture
+def fake_market(monkeypatch):
+    """Record yf.download batches and yf.Ticker lookups against a fake clock."""
+    market = SimpleNamespace(now=0.0, batches=[], tickers=[], listed={"AAPL", "MSFT"})
+
+    def download(tickers, **kwargs):
+        market.batches.append(tickers.split())
+        listed = [s for s in tickers.split() if s in market.listed]
+        return pd.concat([_frame(s, ["Price", "Ticker"]) for s in listed], axis=1)
+
+    def ticker(symbol):
+        market.tickers.append(symbol)
+        return SimpleNamespace(fast_info=SimpleNamespace(last_price=42.0, previous_close=None))
+
+    monkeypatch.setattr(broker.yf, "download", download)
+    monkeypatch.setattr(broker.yf, "Ticker", ticker)
+    monkeypatch.setattr(broker, "time", SimpleNamespace(monotonic=lambda: market.now))
+    return market
+
+
+def test_get_prices_fetches_each_symbol_once(fake_market):
+    prices = broker.Broker().get_prices(["AAPL", "MSFT", "AAPL"])
+    assert prices == {"AAPL": CLOSES[-1], "MSFT": CLOSES[-1]}
+    assert fake_market.batches == [["AAPL", "MSFT"]]
+
+
+def test_get_prices_reuses_fresh_and_refetches_stale(fake_market):
+    b = broker.Broker()
+    b.get_prices(["AAPL"])
+    fake_market.now = broker.PRICE_TTL_SECONDS - 1
+    b.get_prices(["AAPL", "MSFT"])
+    assert fake_market.batches == [["AAPL"], ["MSFT"]]
+
+    fake_market.now = broker.PRICE_TTL_SECONDS + 1
+    b.get_prices(["AAPL", "MSFT"])
+    assert fake_market.batches[-1] == ["AAPL"]
+
+
+def test_get_prices_falls_back_per_symbol_for_missing_batch_entries(fake_market):
+    prices = broker.Broker().get_prices(["AAPL", "NOKIA"])
+    assert prices == {"AAPL": CLOSES[-1], "NOKIA": 42.0}
+    assert fake_market.tickers == ["NOKIA"]
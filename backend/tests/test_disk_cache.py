@@ -0,0 +1,42 @@
+import threading
+
+import numpy as np
+
+import app._disk_cache as disk_cache
+from app._disk_cache import load_history, store_history
+
+
+def test_round_trip():
+    prices = np.array([1.0, 2.0, 3.0])
+    store_history("AAPL", "1y", prices)
+    loaded, age = load_history("AAPL", "1y")
+    assert loaded.tolist() == prices.tolist()
+    assert 0.0 <= age < disk_cache.HISTORY_CACHE_TTL_SECONDS
+    assert load_history("AAPL", "6mo") is None
+
+
+def test_corrupt_cache_file_is_a_miss():
+    path = disk_cache._history_path("AAPL", "1y")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"")
+    assert load_history("AAPL", "1y") is None
+
+    path.write_bytes(np.lib.format.MAGIC_PREFIX)
+    assert load_history("AAPL", "1y") is None
+
+
+def test_concurrent_writers_publish_complete_files():
+    arrays = [np.full(50_000, float(i)) for i in range(8)]
+    threads = [
+        threading.Thread(target=store_history, args=("AAPL", "1y", prices))
+        for prices in arrays
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    loaded, _ = load_history("AAPL", "1y")
+    assert loaded.size == 50_000
+    assert len(set(loaded.tolist())) == 1
+    assert list(disk_cache.HISTORY_CACHE_DIR.glob("*.tmp")) == []
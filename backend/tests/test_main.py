@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import app.broker as broker
+import app.main as main
+from app.broker import Broker
+from app.portfolio import Portfolio
+
+CLOSES = [100.0, 110.0, 99.0]
+
+
+def _download(tickers, **kwargs):
+    """Mimic yf.download in its default (Price, Ticker) column layout."""
+    symbols = tickers.split() if isinstance(tickers, str) else list(tickers)
+    data = pd.DataFrame({("Close", symbol): CLOSES for symbol in symbols})
+    data.columns = pd.MultiIndex.from_tuples(data.columns, names=["Price", "Ticker"])
+    return data
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(broker.yf, "download", _download)
+    monkeypatch.setattr(main, "portfolio", Portfolio(cash=100000.0))
+    monkeypatch.setattr(main, "broker", Broker())
+    return TestClient(main.app)
+
+
+def test_historical_and_simulate_return_prices(client):
+    historical = client.get("/historical/AAPL").json()
+    assert historical["prices"] == CLOSES
+    assert historical["count"] == 3
+
+    simulated = client.get("/simulate/AAPL").json()
+    assert simulated["data_points"] == 3
+
+
+def test_risk_reports_volatility_from_history(client):
+    assert client.post("/trade", json={"symbol": "AAPL", "quantity": 10, "action": "buy"}).status_code == 200
+    risk = client.get("/risk").json()
+    assert risk["volatility"] > 0
@@ -0,0 +1,51 @@
+from app.portfolio import Portfolio
+
+
+def test_buy_tracks_average_price():
+    portfolio = Portfolio(cash=1000.0)
+    portfolio.buy("AAPL", 10.0, 10)
+    portfolio.buy("AAPL", 20.0, 10)
+    assert portfolio.cash == 700.0
+    assert portfolio.get_all_positions() == [
+        {"symbol": "AAPL", "quantity": 20, "avg_price": 15.0}
+    ]
+
+
+def test_partial_sell_keeps_average_price():
+    portfolio = Portfolio(cash=1000.0)
+    portfolio.buy("AAPL", 10.0, 10)
+    portfolio.buy("AAPL", 20.0, 10)
+    assert portfolio.remove_position("AAPL", 5)
+    assert portfolio.get_position("AAPL") == {"quantity": 15, "avg_price": 15.0}
+    assert portfolio.costs.tolist() == [225.0]
+
+
+def test_zero_quantity_buy_creates_no_holding():
+    portfolio = Portfolio(cash=1000.0)
+    portfolio.buy("AAPL", 10.0, 0)
+    portfolio.buy("AAPL", 10.0, -5)
+    portfolio.add_position("MSFT", 0, 10.0)
+    assert portfolio.cash == 1000.0
+    assert portfolio.value({"AAPL": 10.0, "MSFT": 10.0}) == 1000.0
+    assert portfolio.get_all_positions() == []
+    assert portfolio.get_position("AAPL") is None
+
+
+def test_fractional_buy_charges_whole_shares_only():
+    portfolio = Portfolio(cash=1000.0)
+    portfolio.buy("A", 10.0, 2.5)
+    assert portfolio.cash == 980.0
+    assert portfolio.holdings == {"A": 2}
+    assert portfolio.value({"A": 10.0}) == 1000.0
+
+
+def test_closing_a_position_that_is_not_last_keeps_insertion_order():
+    portfolio = Portfolio(cash=1000.0)
+    for symbol, price in [("A", 10.0), ("B", 20.0), ("C", 30.0)]:
+        portfolio.buy(symbol, price, 1)
+
+    assert portfolio.remove_position("A", 1)
+    assert [pos["symbol"] for pos in portfolio.get_all_positions()] == ["B", "C"]
+    assert portfolio.get_position("C") == {"quantity": 1, "avg_price": 30.0}
+    assert portfolio.remove_position("C", 1)
+    assert portfolio.holdings == {"B": 1}
@@ -0,0 +1,70 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.portfolio import Portfolio
+from app.simulator import RiskCalculator, all_in_sim
+
+
+def _risk(positions, prices, history):
+    return RiskCalculator.calculate_portfolio_risk(
+        positions, lambda symbols: prices, history
+    )
+
+
+def test_volatility_from_known_price_series():
+    positions = [{"symbol": "A", "quantity": 10}]
+    history = {"A": np.array([100.0, 110.0, 99.0])}
+
+    returns = [math.log(110 / 100), math.log(99 / 110)]
+    mean = sum(returns) / 2
+    expected = math.sqrt(sum((r - mean) ** 2 for r in returns) / 2) * math.sqrt(252)
+
+    result = _risk(positions, {"A": 50.0}, history)
+    assert result["volatility"] == pytest.approx(round(expected, 3))
+    assert result["volatility"] > 0
+
+
+def test_volatility_is_value_weighted():
+    positions = [{"symbol": "A", "quantity": 1}, {"symbol": "B", "quantity": 3}]
+    flat = np.array([10.0, 10.0, 10.0])
+    moving = np.array([10.0, 11.0, 10.0])
+    vol_moving = float(np.std(np.diff(np.log(moving))) * np.sqrt(252))
+
+    result = _risk(positions, {"A": 10.0, "B": 10.0}, {"A": flat, "B": moving})
+    assert result["volatility"] == pytest.approx(round(0.75 * vol_moving, 3))
+
+
+def test_volatility_ignores_non_positive_closes():
+    positions = [{"symbol": "A", "quantity": 1}]
+    history = {"A": np.array([100.0, 0.0, 110.0, -5.0, np.nan, 99.0])}
+
+    with np.errstate(all="raise"):
+        result = _risk(positions, {"A": 100.0}, history)
+    clean = _risk(positions, {"A": 100.0}, {"A": np.array([100.0, 110.0, 99.0])})
+    assert result["volatility"] == clean["volatility"]
+
+
+def test_volatility_without_history_is_zero():
+    positions = [{"symbol": "A", "quantity": 1}]
+    assert _risk(positions, {"A": 1.0}, {"A": np.array([5.0])})["volatility"] == 0.0
+    assert _risk(positions, {"A": 1.0}, None)["volatility"] == 0.0
+
+
+def test_all_in_sim_matches_numpy_exactly():
+    prices = np.array([33.3, 40.0, 10.0])
+    portfolio = Portfolio(cash=10000.0)
+    curve = all_in_sim(portfolio, "AAPL", prices)
+
+    quantity = 10000.0 // 33.3
+    expected = (10000.0 - quantity * 33.3) + quantity * prices
+    assert curve == expected.tolist()
+    assert curve[0] == 10000.0
+
+
+def test_all_in_sim_with_cash_below_first_price():
+    portfolio = Portfolio(cash=10.0)
+    curve = all_in_sim(portfolio, "AAPL", np.array([33.3, 40.0]))
+    assert curve == [10.0, 10.0]
+    assert portfolio.get_all_positions() == []